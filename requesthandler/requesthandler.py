@@ -1,13 +1,58 @@
-import random, asyncio, aiohttp, signal, time, logging
+import random, asyncio, aiohttp, signal, logging, atexit, weakref
+import importlib.util, ssl, sys
+from collections import deque
+from functools import lru_cache
 from threading import Lock
+from types import MappingProxyType
+from yarl import URL
 
 logger = logging.getLogger(__name__)
 
-class RequestHandler:
-    _instance = None
-    _lock = Lock()
+_NET_TAGS = ("network", "http", "get")
+
+# raised without touching the network while a host's circuit breaker is open
+class HostUnavailableError(RuntimeError):
+    pass
+
+class _MergingAdapter(logging.LoggerAdapter):
+    # stock LoggerAdapter (before 3.13) replaces per-call extra instead of merging it
+    def process(self, msg, kwargs):
+        extra = kwargs.get("extra")
+        kwargs["extra"] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
+net_log = _MergingAdapter(logger, {"tags": _NET_TAGS})
+
+# only advertise brotli when a decoder is available, otherwise aiohttp can't decompress "br" bodies
+if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# optional fast JSON decoder; both parse bytes directly, without a separate UTF-8 decode pass
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# optional HTTP/2 transport
+try:
+    import httpx
+except ImportError:
+    httpx = None
+_HAS_H2 = importlib.util.find_spec("h2") is not None
 
-    USER_AGENTS = [
+# same check as aiohttp's connector: newer Pythons fixed the leak and aiohttp warns if the flag is passed anyway
+_NEEDS_CLEANUP_CLOSED = sys.version_info < (3, 12, 8) or (3, 13, 0) <= sys.version_info < (3, 13, 1)
+
+_TOTAL_TIMEOUT = 30
+_CONNECT_TIMEOUT = 10
+_READ_TIMEOUT = 20
+_STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=_CONNECT_TIMEOUT, sock_read=_READ_TIMEOUT)
+
+_DEFAULT_HEADERS = {"Accept-Encoding": _ACCEPT_ENCODING, "Accept": "*/*", "Connection": "keep-alive"}
+
+_USER_AGENTS = (
     # Chrome on Windows
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.6312.86 Safari/537.36",
 
@@ -28,14 +73,102 @@ class RequestHandler:
 
     # Brave on macOS (Brave uses the Chrome engine, but identifies itself differently)
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_3_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.6312.86 Safari/537.36 Brave/123.1.59.120"
-]
+)
+
+# fully-formed read-only header maps, one per user-agent, shared by every request and rotated round-robin
+_UA_HEADERS = tuple(MappingProxyType({**_DEFAULT_HEADERS, "User-Agent": ua}) for ua in _USER_AGENTS)
+_UA_COUNT = len(_UA_HEADERS)
+
+@lru_cache(maxsize=4096)
+def _cached_url(url):
+    # aiohttp accepts URL objects as-is, so repeated targets are parsed only once
+    return URL(url, encoded=False)
+
+_HOST_STATE_MAX = 1024
+
+# configure() defaults; see the README for what each option does
+_CONFIG_DEFAULTS = {
+    "batch_range": (3, 5),
+    "cooldown_range": (5, 10),
+    "empty_poll": 0.1,
+    "scheduling": "batched",
+    "host_limit": None,
+    "transport": "aiohttp",
+    "retries": 3,
+    "backoff_base": 0.2,
+    "backoff_max": 5.0,
+    "breaker_threshold": 5,
+    "breaker_reset": 30.0,
+}
+
+# gateway/overload answers that are worth retrying and count against the origin's breaker
+_RETRY_STATUSES = frozenset((502, 503, 504))
+
+def _is_tls_failure(exc):
+    # aiohttp raises a dedicated type; httpx only chains the ssl.SSLError under its ConnectError
+    if isinstance(exc, aiohttp.ClientSSLError):
+        return True
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+_RAND_RING_SIZE = 1024  # power of two, indices wrap with a mask
+
+# SIGBREAK only exists on Windows
+_SHUTDOWN_SIGNALS = tuple(getattr(signal, name) for name in ("SIGINT", "SIGTERM", "SIGBREAK") if hasattr(signal, name))
+
+def _make_shutdown_handler(ref):
+    # resolves the handler lazily so it always targets the loop of the latest configure()
+    def handler(*_):
+        instance = ref()
+        if instance is None or instance._shutdown_started:
+            return
+        logger.info("Shutdown signal received", extra={"tags": ["shutdown"]})
+        loop = instance._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.create_task, instance.shutdown())
+        else:
+            logger.warning("Loop already closed; forcing shutdown", extra={"tags": ["shutdown"]})
+            asyncio.run(instance.shutdown())
+    return handler
+
+def _atexit_shutdown(ref):
+    instance = ref()
+    if instance is None or instance._shutdown_started:
+        return
+    try:
+        asyncio.run(instance.shutdown())
+    except RuntimeError:
+        logger.warning("Could not shut down cleanly at exit", exc_info=True, extra={"tags": ["shutdown"]})
+
+class RequestHandler:
+    _instance = None
+    _lock = Lock()
+
+    USER_AGENTS = _USER_AGENTS
 
     def __new__(cls):
+        # lock-free fast path once the singleton exists
+        if cls._instance is not None:
+            return cls._instance
         with cls._lock:
             if cls._instance is None:
                 logger.debug("Creating a new instance of RequestHandler", extra={"tags": ["singleton", "init"]})
                 cls._instance = super(RequestHandler, cls).__new__(cls)
                 cls._instance._is_configured = False
+                cls._instance._scheduler_task = None
+                cls._instance._scheduler_loop = None
+                cls._instance._shutdown_started = False
+                cls._instance.session = None
+                cls._instance._dq = None
+                cls._instance._loop = None
+                cls._instance._atexit_registered = False
+                cls._instance._configure_lock = None
+                cls._instance._configure_lock_loop = None
         return cls._instance
 
     @classmethod
@@ -43,24 +176,78 @@ class RequestHandler:
         logger.info("Resetting RequestHandler singleton instance", extra={"tags": ["reset"]})
         cls._instance = None
 
-    async def configure(self):
+    async def configure(self, **options):
+        unknown = options.keys() - _CONFIG_DEFAULTS.keys()
+        if unknown:
+            raise TypeError(f"configure() got unexpected keyword arguments: {', '.join(sorted(unknown))}")
+        # ranges may be given as lists; store them as tuples so repeated calls compare equal
+        for key in ("batch_range", "cooldown_range"):
+            if key in options:
+                options[key] = tuple(options[key])
+        config = {**_CONFIG_DEFAULTS, **options}
+
+        if config["scheduling"] not in ("batched", "streaming"):
+            raise ValueError(f"Unknown scheduling mode {config['scheduling']!r}, expected 'batched' or 'streaming'")
+        if config["transport"] not in ("aiohttp", "httpx2"):
+            raise ValueError(f"Unknown transport {config['transport']!r}, expected 'aiohttp' or 'httpx2'")
+        if config["transport"] == "httpx2" and (httpx is None or not _HAS_H2):
+            raise RuntimeError("The 'httpx2' transport requires httpx with HTTP/2 support. Install it with 'pip install requesthandler[http2]'.")
+
         current_loop = asyncio.get_running_loop()
+        if self._is_configured and self._scheduler_loop is current_loop and not self._shutdown_started:
+            self._warn_if_config_differs(options)
+            return
+
         logger.debug("Starting configure()", extra={"tags": ["configure"]})
 
-        if not self._is_configured or self._scheduler_loop != current_loop:
-            if hasattr(self, '_scheduler_task'):
+        # asyncio.Lock binds to the loop it is first used on, so keep one per loop
+        if self._configure_lock is None or self._configure_lock_loop is not current_loop:
+            self._configure_lock = asyncio.Lock()
+            self._configure_lock_loop = current_loop
+
+        async with self._configure_lock:
+            # another task may have finished configuring while we waited for the lock
+            if self._is_configured and self._scheduler_loop is current_loop and not self._shutdown_started:
+                self._warn_if_config_differs(options)
+                return
+
+            if self._scheduler_task is not None:
                 try:
                     logger.info("Reconfiguring session: closing previous session and cancelling task", extra={"tags": ["configure"]})
-                    await self.session.close()
+                    await self._close_session()
                     self._scheduler_task.cancel()
                     await self._scheduler_task
                 except asyncio.CancelledError:
                     logger.warning("Scheduler task cancelled during reconfiguration", extra={"tags": ["configure"]})
+            self._fail_pending("RequestHandler was reconfigured before the request was sent")
 
-            self.queue = asyncio.Queue()
-            self.session = aiohttp.ClientSession()
-            self._batch_size = random.randint(3, 5)
-            logger.debug(f"Batch size set to {self._batch_size}", extra={"tags": ["configure"]})
+            # single consumer (the scheduler), so a deque plus a wakeup event is all the queue we need
+            self._dq = deque()
+            self._ev = asyncio.Event()
+            self._config = config
+            self._batch_range = config["batch_range"]
+            self._cooldown_range = config["cooldown_range"]
+            self._empty_poll = config["empty_poll"]
+            self._scheduling = config["scheduling"]
+            self._host_limit = config["host_limit"]
+            self._host_sem = {}
+            self._transport = config["transport"]
+            self._retries = config["retries"]
+            self._backoff_base = config["backoff_base"]
+            self._backoff_max = config["backoff_max"]
+            self._breaker_threshold = config["breaker_threshold"]
+            self._breaker_reset = config["breaker_reset"]
+            self._host_state = {}
+            self._retry_errors = (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError, asyncio.TimeoutError)
+            if self._transport == "httpx2":
+                self._retry_errors += (httpx.TransportError,)
+            self.session = self._create_session()
+            self._ua_idx = random.randrange(_UA_COUNT)
+            self._refill_rand_ring()
+            self._batch_size = self._rand_ring[0][0]
+            self._rand_idx = 1
+            logger.debug("Batch size set to %s", self._batch_size, extra={"tags": ["configure"]})
+            self._loop = current_loop
             self._register_shutdown_hooks()
             self._scheduler_task = asyncio.create_task(self._scheduler())
             self._scheduler_loop = current_loop
@@ -69,107 +256,334 @@ class RequestHandler:
 
             logger.info("RequestHandler configured successfully", extra={"tags": ["configure"]})
 
-    def _register_shutdown_hooks(self):
-        loop = asyncio.get_running_loop()
+    def _warn_if_config_differs(self, options):
+        # only arguments the caller actually passed count; a bare configure() never warns
+        ignored = sorted(key for key, value in options.items() if self._config[key] != value)
+        if ignored:
+            logger.warning(
+                "RequestHandler is already configured on this loop; ignoring configure() arguments: %s",
+                ", ".join(ignored),
+                extra={"tags": ["configure"]},
+            )
 
-        def on_shutdown():
-            logger.info("Shutdown signal received", extra={"tags": ["shutdown"]})
-            asyncio.create_task(self.shutdown())
+    def _fail_pending(self, reason):
+        # requests still waiting in the deque would otherwise never resolve
+        if not self._dq:
+            return
+        count = 0
+        while self._dq:
+            future = self._dq.popleft()[-1]
+            if not future.done() and not future.get_loop().is_closed():
+                future.set_exception(RuntimeError(reason))
+                count += 1
+        logger.warning("Failed %s queued requests: %s", count, reason, extra={"tags": ["shutdown"]})
 
-        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGBREAK):
+    def _create_session(self):
+        if self._transport == "httpx2":
+            # one multiplexed HTTP/2 connection carries many concurrent streams per host
+            logger.debug("Creating HTTP/2 client", extra={"tags": ["configure", "session"]})
+            return httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=75),
+                # httpx has no overall request timeout; only per-phase limits apply on this transport
+                timeout=httpx.Timeout(connect=_CONNECT_TIMEOUT, read=_READ_TIMEOUT, write=_READ_TIMEOUT, pool=_CONNECT_TIMEOUT),
+                headers=_DEFAULT_HEADERS,
+            )
+
+        # aiohttp already sets TCP_NODELAY on every connection it opens; TCPConnector has no knob for it
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=30,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=_NEEDS_CLEANUP_CLOSED,
+        )
+        timeout = aiohttp.ClientTimeout(total=_TOTAL_TIMEOUT, connect=_CONNECT_TIMEOUT, sock_read=_READ_TIMEOUT)
+        logger.debug("Creating client session", extra={"tags": ["configure", "session"]})
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=_DEFAULT_HEADERS, auto_decompress=True)
+
+    def _session_closed(self):
+        if self._transport == "httpx2":
+            return self.session.is_closed
+        return self.session.closed
+
+    async def _close_session(self):
+        if self._transport == "httpx2":
+            await self.session.aclose()
+        else:
+            await self.session.close()
+
+    def _register_shutdown_hooks(self):
+        loop = self._loop
+        handler = _make_shutdown_handler(weakref.ref(self))
+
+        unsupported = set()
+        for sig in _SHUTDOWN_SIGNALS:
             try:
-                loop.add_signal_handler(sig, on_shutdown)
+                loop.add_signal_handler(sig, handler)
             except NotImplementedError:
-                logger.warning(f"Signal {sig} not supported on this OS", extra={"tags": ["shutdown", "signal"]})
-                def sync_shutdown(*_):
-                    try:
-                        loop = asyncio.get_running_loop()
-                        loop.create_task(self.shutdown())
-                    except RuntimeError:
-                        logger.warning("Loop already closed; forcing shutdown", extra={"tags": ["shutdown"]})
-                        asyncio.run(self.shutdown())
-                signal.signal(sig, sync_shutdown)
+                logger.warning("Signal %s not supported on this OS", sig, extra={"tags": ["shutdown", "signal"]})
+                unsupported.add(sig)
+
+        if unsupported:
+            for sig in unsupported:
+                signal.signal(sig, handler)
+            if not self._atexit_registered:
+                atexit.register(_atexit_shutdown, weakref.ref(self))
+                self._atexit_registered = True
 
     async def _scheduler(self):
         logger.info("Scheduler started", extra={"tags": ["scheduler"]})
+        if self._scheduling == "streaming":
+            await self._stream()
+            return
+
+        # reused across iterations; emptied right after each gather so finished tasks aren't kept through the cooldown
+        batch = []
         while True:
-            batch = []
-            for _ in range(self._batch_size):
-                try:
-                    coro = await asyncio.wait_for(self.queue.get(), timeout=1)
-                    task = asyncio.create_task(coro)
-                    batch.append(task)
-                    logger.debug("Task added to batch", extra={"tags": ["scheduler"]})
-                except asyncio.TimeoutError:
-                    break
-
-            if batch:
-                logger.debug(f"Executing batch of size {len(batch)}", extra={"tags": ["scheduler"]})
-                await asyncio.gather(*batch)
-                self._batch_size = random.randint(3, 5)
-                delay = random.randint(5, 10)
-                logger.info(f"Batch complete. Sleeping for {delay}s", extra={"tags": ["scheduler"]})
+            item = await self._next_item()
+            debug = logger.isEnabledFor(logging.DEBUG)
+            batch.append(asyncio.create_task(self._do_fetch(*item)))
+            if debug:
+                logger.debug("Task added to batch", extra={"tags": ["scheduler"]})
+            self._drain_into(batch, debug)
+
+            # give a partially filled batch one grace period to fill up, then run whatever is there
+            if len(batch) < self._batch_size and self._empty_poll > 0:
+                await asyncio.sleep(self._empty_poll)
+                self._drain_into(batch, debug)
+
+            if debug:
+                logger.debug("Executing batch of size %s", len(batch), extra={"tags": ["scheduler"]})
+            await asyncio.gather(*batch)
+            batch.clear()
+            self._batch_size, delay = self._rand_ring[self._rand_idx]
+            self._rand_idx = (self._rand_idx + 1) & (_RAND_RING_SIZE - 1)
+            if self._rand_idx == 0:
+                self._refill_rand_ring()
+            if not self._dq:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Batch complete. Sleeping for %ss", delay, extra={"tags": ["scheduler"]})
                 await asyncio.sleep(delay)
+            else:
+                if debug:
+                    logger.debug("Batch complete. Queue not empty, continuing", extra={"tags": ["scheduler"]})
+                await asyncio.sleep(0)
 
-    async def get(self, url, raw=False):
-        if not self._is_configured:
-            raise RuntimeError("RequestHandler not configured yet. Call 'await handler.configure()' first.")
+    def _refill_rand_ring(self):
+        # draw batch sizes and cooldowns in bulk instead of two RNG calls per batch
+        lo, hi = self._batch_range
+        c_lo, c_hi = self._cooldown_range
+        sizes = random.choices(range(lo, hi + 1), k=_RAND_RING_SIZE)
+        _random = random.random
+        self._rand_ring = [(size, round(c_lo + (c_hi - c_lo) * _random(), 3)) for size in sizes]
 
-        user_agent = random.choice(self.USER_AGENTS)
-        headers = {"User-Agent": user_agent}
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
+    async def _stream(self):
+        # dispatch every request as soon as it arrives; concurrency is capped by the connector and host semaphores
+        tasks = set()
+        try:
+            while True:
+                item = await self._next_item()
+                task = asyncio.create_task(self._do_fetch(*item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Task dispatched", extra={"tags": ["scheduler"]})
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
 
-        async def fetch():
-            start = time.time()
-            try:
-                async with self.session.get(url, headers=headers) as response:
-                    duration = round(time.time() - start, 3)
-                    status_code = response.status
-                    result = await response.read() if raw else await response.text()    
-                    logger.info(
-                        f"GET request successful - status: {status_code}",
-                        extra={
-                            "tags": ["network", "http", "get"],
-                            "duration": duration,
-                            "status_code": status_code,
-                            "url": url,
-                            "agent": user_agent,
-                        },
-                    )
-                    future.set_result(result)
-            except Exception as e:
-                duration = round(time.time() - start, 3)
-                logger.error(
-                    f"GET request failed for {url}",
-                    exc_info=True,
+    async def _next_item(self):
+        dq = self._dq
+        while not dq:
+            self._ev.clear()
+            await self._ev.wait()
+        return dq.popleft()
+
+    def _drain_into(self, batch, debug):
+        dq = self._dq
+        while dq and len(batch) < self._batch_size:
+            batch.append(asyncio.create_task(self._do_fetch(*dq.popleft())))
+            if debug:
+                logger.debug("Task added to batch", extra={"tags": ["scheduler"]})
+
+    async def _do_fetch(self, url, headers, raw, encoding, stream, as_json, future):
+        if self._host_limit is None:
+            await self._fetch(url, headers, raw, encoding, stream, as_json, future)
+            return
+
+        host = url.host
+        sem = self._host_sem.get(host)
+        if sem is None:
+            sem = self._host_sem[host] = asyncio.Semaphore(self._host_limit)
+        async with sem:
+            await self._fetch(url, headers, raw, encoding, stream, as_json, future)
+
+    async def _fetch(self, url, headers, raw, encoding, stream, as_json, future):
+        loop = self._loop
+        start = loop.time()
+        # breaker state is per origin (scheme, host, port): one dead port must not block other services on the host
+        origin = url.origin()
+        try:
+            state = self._host_state.get(origin)
+            if state is not None and state[1] > start:
+                raise HostUnavailableError(f"Circuit open for {origin}; failing fast")
+
+            send = self._httpx_get if self._transport == "httpx2" else self._aiohttp_get
+            for attempt in range(self._retries + 1):
+                try:
+                    response, result = await send(url, headers, raw, encoding, stream, as_json)
+                except self._retry_errors as e:
+                    # certificate/TLS failures won't fix themselves; don't retry or count them
+                    if _is_tls_failure(e):
+                        raise
+                    if attempt == self._retries:
+                        self._record_failure(origin, loop.time())
+                        raise
+                    reason = type(e).__name__
+                else:
+                    status_code = response.status_code if self._transport == "httpx2" else response.status
+                    if status_code not in _RETRY_STATUSES:
+                        self._host_state.pop(origin, None)
+                        break
+                    if attempt == self._retries:
+                        # out of retries: the caller still gets the error response, but it counts against the origin
+                        self._record_failure(origin, loop.time())
+                        break
+                    if stream:
+                        await self._release(response)
+                    reason = f"HTTP {status_code}"
+                delay = min(self._backoff_max, self._backoff_base * (2 ** attempt)) + random.random() * 0.1
+                net_log.warning(
+                    "GET request to %s failed (%s), retrying in %.2fs",
+                    url,
+                    reason,
+                    delay,
+                    extra={"attempt": attempt + 1, "url": str(url), "agent": headers["User-Agent"]},
+                )
+                await asyncio.sleep(delay)
+
+            duration = round(loop.time() - start, 3)
+            if net_log.isEnabledFor(logging.INFO):
+                net_log.info(
+                    "GET request successful - status: %s",
+                    status_code,
                     extra={
-                        "tags": ["network", "http", "get"],
-                        "error": str(e),
-                        "url": url,
-                        "agent": user_agent,
                         "duration": duration,
+                        "status_code": status_code,
+                        "url": str(url),
+                        "agent": headers["User-Agent"],
                     },
                 )
+            if not future.done():
+                future.set_result(result)
+            elif stream:
+                await self._release(response)
+        except asyncio.CancelledError:
+            # don't leave the caller awaiting a future nobody will resolve
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            duration = round(loop.time() - start, 3)
+            net_log.error(
+                "GET request failed for %s",
+                url,
+                exc_info=True,
+                extra={
+                    "error": str(e),
+                    "url": str(url),
+                    "agent": headers["User-Agent"],
+                    "duration": duration,
+                },
+            )
+            if not future.done():
                 future.set_exception(e)
 
-        self.queue.put_nowait(fetch())
-        logger.debug(f"GET request queued: {url}", extra={"tags": ["network", "http"]})
+    async def _release(self, response):
+        if self._transport == "httpx2":
+            await response.aclose()
+        else:
+            response.release()
+
+    def _record_failure(self, origin, now):
+        host_state = self._host_state
+        fail_count = host_state.get(origin, (0, 0))[0] + 1
+        open_until = now + self._breaker_reset if fail_count >= self._breaker_threshold else 0
+        host_state[origin] = (fail_count, open_until)
+        if len(host_state) > _HOST_STATE_MAX:
+            # forget origins whose circuit isn't open so one-off failures don't accumulate forever
+            for key in [key for key, (_, until) in host_state.items() if until <= now]:
+                del host_state[key]
+        if open_until:
+            logger.warning(
+                "Opening circuit for %s for %ss after %s failures",
+                origin,
+                self._breaker_reset,
+                fail_count,
+                extra={"tags": ["network", "circuit"]},
+            )
+
+    async def _aiohttp_get(self, url, headers, raw, encoding, stream, as_json):
+        if stream:
+            # the caller owns the open response and has to release it (e.g. ``async with response:``);
+            # the session's total timeout would also cut off reading the body, so streams only get connect/read limits
+            response = await self.session.get(url, headers=headers, timeout=_STREAM_TIMEOUT)
+            return response, response
+        async with self.session.get(url, headers=headers) as response:
+            if as_json:
+                return response, _json_loads(await response.read())
+            if raw:
+                return response, await response.read()
+            # a known encoding skips aiohttp's charset detection over the whole body
+            return response, await response.text(encoding=encoding or response.charset or "utf-8", errors="replace")
+
+    async def _httpx_get(self, url, headers, raw, encoding, stream, as_json):
+        request = self.session.build_request("GET", str(url), headers=headers)
+        # with stream=True the caller owns the open response and has to ``await response.aclose()``
+        response = await self.session.send(request, stream=stream)
+        if stream:
+            return response, response
+        if as_json:
+            return response, _json_loads(response.content)
+        if raw:
+            return response, response.content
+        if encoding:
+            response.encoding = encoding
+        return response, response.text
+
+    async def get(self, url, raw=False, encoding=None, stream=False, as_json=False):
+        if not self._is_configured:
+            raise RuntimeError("RequestHandler not configured yet. Call 'await handler.configure()' first.")
+        if self._shutdown_started:
+            raise RuntimeError("RequestHandler has been shut down. Call 'await handler.configure()' again first.")
+
+        i = self._ua_idx
+        self._ua_idx = (i + 1) % _UA_COUNT
+        headers = _UA_HEADERS[i]
+        future = self._loop.create_future()
+
+        self._dq.append((_cached_url(url), headers, raw, encoding, stream, as_json, future))
+        self._ev.set()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GET request queued: %s", url, extra={"tags": ["network", "http"]})
         return await future
 
     async def shutdown(self):
-        if getattr(self, "_shutdown_started", False):
+        if self._shutdown_started:
             return
         self._shutdown_started = True
 
         logger.info("Initiating shutdown...", extra={"tags": ["shutdown"]})
-        if hasattr(self, "_scheduler_task"):
+        if self._scheduler_task is not None:
             self._scheduler_task.cancel()
             try:
                 await self._scheduler_task
             except asyncio.CancelledError:
                 logger.debug("Scheduler task cancelled", extra={"tags": ["shutdown"]})
+        self._fail_pending("RequestHandler was shut down before the request was sent")
 
-        if hasattr(self, 'session') and self.session and not self.session.closed:
-            await self.session.close()
+        if self.session is not None and not self._session_closed():
+            await self._close_session()
             logger.info("Session closed", extra={"tags": ["shutdown"]})
@@ -9,6 +9,13 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        "aiohttp>=3.11.18"
-    ]
+        "aiohttp>=3.11.18",
+        "yarl"
+    ],
+    extras_require={
+        "brotli": ["Brotli"],
+        "http2": ["httpx[http2]"],
+        "orjson": ["orjson"],
+        "test": ["pytest"]
+    }
 )
@@ -0,0 +1,10 @@
+import pytest
+
+from requesthandler.requesthandler import RequestHandler
+
+
+@pytest.fixture(autouse=True)
+def fresh_singleton():
+    RequestHandler.reset()
+    yield
+    RequestHandler.reset()
@@ -0,0 +1,47 @@
+import socket
+
+from aiohttp import web
+
+from requesthandler.requesthandler import RequestHandler
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(handler, port=0):
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def ok(request):
+    return web.Response(text="ok")
+
+
+async def configured_handler(**kwargs):
+    # no batching delays so tests run in milliseconds
+    kwargs.setdefault("empty_poll", 0)
+    kwargs.setdefault("cooldown_range", (0, 0))
+    kwargs.setdefault("backoff_base", 0.01)
+    handler = RequestHandler()
+    await handler.configure(**kwargs)
+    return handler
+
+
+def count_sends(handler, method="_aiohttp_get"):
+    calls = []
+    send = getattr(handler, method)
+
+    async def counting_send(url, *args):
+        calls.append(url)
+        return await send(url, *args)
+
+    setattr(handler, method, counting_send)
+    return calls
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+
+import pytest
+from aiohttp import web
+
+from requesthandler.requesthandler import RequestHandler
+from support import configured_handler, ok, start_server
+
+
+def test_repeated_configure_is_a_no_op(caplog):
+    async def main():
+        handler = await configured_handler(batch_range=[2, 4])
+        session, task = handler.session, handler._scheduler_task
+        with caplog.at_level(logging.WARNING):
+            await handler.configure()
+            await handler.configure(batch_range=(2, 4), empty_poll=0)
+        same = handler.session is session and handler._scheduler_task is task
+        await handler.shutdown()
+        return same
+
+    assert asyncio.run(main())
+    assert "ignoring configure() arguments" not in caplog.text
+
+
+def test_differing_arguments_are_warned_about(caplog):
+    async def main():
+        handler = await configured_handler(scheduling="streaming", host_limit=4)
+        with caplog.at_level(logging.WARNING):
+            await handler.configure(scheduling="batched", host_limit=None)
+        scheduling, host_limit = handler._scheduling, handler._host_limit
+        await handler.shutdown()
+        return scheduling, host_limit
+
+    assert asyncio.run(main()) == ("streaming", 4)
+    assert "ignoring configure() arguments: host_limit, scheduling" in caplog.text
+
+
+def test_invalid_arguments_raise_even_when_configured():
+    async def main():
+        handler = await configured_handler()
+        with pytest.raises(ValueError):
+            await handler.configure(scheduling="bogus")
+        with pytest.raises(ValueError):
+            await handler.configure(transport="carrier-pigeon")
+        with pytest.raises(TypeError):
+            await handler.configure(batch_size=3)
+        await handler.shutdown()
+
+    asyncio.run(main())
+
+
+def test_concurrent_first_configure_creates_one_session(monkeypatch):
+    created = []
+    create = RequestHandler._create_session
+
+    def counting_create(self):
+        created.append(self)
+        return create(self)
+
+    monkeypatch.setattr(RequestHandler, "_create_session", counting_create)
+
+    async def main():
+        handler = RequestHandler()
+        await asyncio.gather(*(handler.configure(empty_poll=0) for _ in range(5)))
+        await handler.shutdown()
+
+    asyncio.run(main())
+    assert len(created) == 1
+
+
+def test_configure_after_shutdown_rebuilds():
+    async def main():
+        runner, port = await start_server(ok)
+        url = f"http://127.0.0.1:{port}/"
+        handler = await configured_handler()
+        await handler.shutdown()
+        with pytest.raises(RuntimeError):
+            await handler.get(url)
+        await handler.configure(empty_poll=0, cooldown_range=(0, 0))
+        result = await asyncio.wait_for(handler.get(url), 2)
+        await handler.shutdown()
+        await runner.cleanup()
+        return result
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_shutdown_fails_requests_still_queued():
+    async def slow(request):
+        await asyncio.sleep(0.5)
+        return web.Response(text="ok")
+
+    async def main():
+        runner, port = await start_server(slow)
+        handler = await configured_handler(batch_range=(1, 1))
+        calls = [asyncio.create_task(handler.get(f"http://127.0.0.1:{port}/")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        await handler.shutdown()
+        done, pending = await asyncio.wait(calls, timeout=1)
+        await runner.cleanup()
+        queued_errors = [type(task.exception()) for task in calls[1:]]
+        return len(pending), calls[0].cancelled(), queued_errors
+
+    assert asyncio.run(main()) == (0, True, [RuntimeError, RuntimeError])
@@ -0,0 +1,32 @@
+import asyncio
+
+from aiohttp import web
+
+from requesthandler.requesthandler import _DEFAULT_HEADERS, RequestHandler
+from support import configured_handler, start_server
+
+
+def test_user_agents_rotate_round_robin_with_default_headers():
+    seen = []
+
+    async def record(request):
+        seen.append(dict(request.headers))
+        return web.Response(text="ok")
+
+    async def main():
+        runner, port = await start_server(record)
+        handler = await configured_handler(batch_range=(1, 1))
+        start = handler._ua_idx
+        count = len(RequestHandler.USER_AGENTS)
+        for _ in range(count + 1):
+            await handler.get(f"http://127.0.0.1:{port}/")
+        await handler.shutdown()
+        await runner.cleanup()
+        return start, count
+
+    start, count = asyncio.run(main())
+    agents = [headers["User-Agent"] for headers in seen]
+    expected = [RequestHandler.USER_AGENTS[(start + i) % count] for i in range(count + 1)]
+    assert agents == expected
+    for headers in seen:
+        assert headers["Accept-Encoding"] == _DEFAULT_HEADERS["Accept-Encoding"]
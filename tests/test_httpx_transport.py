@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import requesthandler.requesthandler as rh
+from support import configured_handler, count_sends, start_server
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+
+async def payload(request):
+    return web.json_response({"ok": True})
+
+
+def test_httpx2_transport_serves_text_raw_json_and_stream():
+    async def main():
+        runner, port = await start_server(payload)
+        url = f"http://127.0.0.1:{port}/"
+        handler = await configured_handler(transport="httpx2")
+        assert isinstance(handler.session, httpx.AsyncClient)
+        text = await handler.get(url)
+        raw = await handler.get(url, raw=True)
+        data = await handler.get(url, as_json=True)
+        response = await handler.get(url, stream=True)
+        streamed = b"".join([chunk async for chunk in response.aiter_bytes()])
+        await response.aclose()
+        await handler.shutdown()
+        closed = handler.session.is_closed
+        await runner.cleanup()
+        return text, raw, data, streamed, closed
+
+    text, raw, data, streamed, closed = asyncio.run(main())
+    assert text == '{"ok": true}'
+    assert raw == streamed == b'{"ok": true}'
+    assert data == {"ok": True}
+    assert closed
+
+
+def test_httpx2_without_h2_fails_before_touching_the_session(monkeypatch):
+    monkeypatch.setattr(rh, "_HAS_H2", False)
+
+    async def main():
+        with pytest.raises(RuntimeError, match="HTTP/2"):
+            await configured_handler(transport="httpx2")
+
+    asyncio.run(main())
+
+
+def test_httpx2_tls_failures_are_not_retried_or_counted():
+    async def main():
+        runner, port = await start_server(payload)
+        handler = await configured_handler(transport="httpx2", retries=3, breaker_threshold=1)
+        calls = count_sends(handler, "_httpx_get")
+        with pytest.raises(httpx.ConnectError):
+            await handler.get(f"https://127.0.0.1:{port}/")
+        state = dict(handler._host_state)
+        await handler.shutdown()
+        await runner.cleanup()
+        return len(calls), state
+
+    assert asyncio.run(main()) == (1, {})
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from support import configured_handler, start_server
+
+CAFE_LATIN1 = "café".encode("latin-1")
+
+
+async def fetch(server_handler, **kwargs):
+    runner, port = await start_server(server_handler)
+    handler = await configured_handler()
+    try:
+        return await handler.get(f"http://127.0.0.1:{port}/", **kwargs)
+    finally:
+        await handler.shutdown()
+        await runner.cleanup()
+
+
+def test_explicit_encoding_wins():
+    async def latin1(request):
+        return web.Response(body=CAFE_LATIN1, content_type="text/plain")
+
+    assert asyncio.run(fetch(latin1, encoding="latin-1")) == "café"
+
+
+def test_declared_charset_is_used():
+    async def latin1(request):
+        return web.Response(body=CAFE_LATIN1, headers={"Content-Type": "text/plain; charset=latin-1"})
+
+    assert asyncio.run(fetch(latin1)) == "café"
+
+
+def test_undeclared_charset_falls_back_to_utf8():
+    async def utf8(request):
+        return web.Response(body="café".encode(), headers={"Content-Type": "text/plain"})
+
+    assert asyncio.run(fetch(utf8)) == "café"
+
+
+def test_undecodable_bytes_are_replaced():
+    async def latin1(request):
+        return web.Response(body=CAFE_LATIN1, headers={"Content-Type": "text/plain"})
+
+    assert asyncio.run(fetch(latin1)) == "caf�"
+
+
+def test_raw_returns_bytes():
+    async def latin1(request):
+        return web.Response(body=CAFE_LATIN1)
+
+    assert asyncio.run(fetch(latin1, raw=True)) == CAFE_LATIN1
+
+
+def test_stream_returns_open_response():
+    async def chunked(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(3):
+            await response.write(b"x" * 1024)
+        return response
+
+    async def main():
+        runner, port = await start_server(chunked)
+        handler = await configured_handler()
+        async with await handler.get(f"http://127.0.0.1:{port}/", stream=True) as response:
+            body = b"".join([chunk async for chunk in response.content.iter_chunked(512)])
+        await handler.shutdown()
+        await runner.cleanup()
+        return body
+
+    assert asyncio.run(main()) == b"x" * 3072
+
+
+def test_stream_is_released_when_caller_already_cancelled():
+    async def main():
+        # keep the body open so only an explicit release frees the connection
+        finished = asyncio.Event()
+
+        async def slow_unending(request):
+            await asyncio.sleep(0.1)
+            response = web.StreamResponse()
+            await response.prepare(request)
+            await response.write(b"x")
+            await finished.wait()
+            return response
+
+        runner, port = await start_server(slow_unending)
+        handler = await configured_handler()
+        task = asyncio.create_task(handler.get(f"http://127.0.0.1:{port}/", stream=True))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.sleep(0.3)
+        acquired = len(handler.session.connector._acquired)
+        finished.set()
+        await handler.shutdown()
+        await runner.cleanup()
+        return task.cancelled(), acquired
+
+    assert asyncio.run(main()) == (True, 0)
+
+
+def test_as_json_parses_body_bytes():
+    async def payload(request):
+        return web.json_response({"name": "café", "items": [1, 2]})
+
+    assert asyncio.run(fetch(payload, as_json=True)) == {"name": "café", "items": [1, 2]}
+
+
+def test_as_json_raises_on_invalid_body():
+    async def broken(request):
+        return web.Response(text="not json")
+
+    with pytest.raises(ValueError):
+        asyncio.run(fetch(broken, as_json=True))
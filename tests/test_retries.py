@@ -0,0 +1,122 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from requesthandler.requesthandler import HostUnavailableError
+from support import configured_handler, count_sends, free_port, ok, start_server
+
+
+def test_retries_connection_errors_then_raises():
+    async def main():
+        handler = await configured_handler(retries=2, breaker_threshold=100)
+        calls = count_sends(handler)
+        with pytest.raises(aiohttp.ClientConnectorError):
+            await handler.get(f"http://127.0.0.1:{free_port()}/")
+        await handler.shutdown()
+        return calls
+
+    assert len(asyncio.run(main())) == 3
+
+
+def test_breaker_opens_per_origin_and_fails_fast():
+    async def main():
+        runner, healthy_port = await start_server(ok)
+        handler = await configured_handler(retries=0, breaker_threshold=2, breaker_reset=60)
+        calls = count_sends(handler)
+        dead = f"http://127.0.0.1:{free_port()}/"
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await handler.get(dead)
+        with pytest.raises(HostUnavailableError):
+            await handler.get(dead)
+        sends_to_dead = len(calls)
+        # same host, different port is a different origin
+        healthy = await handler.get(f"http://127.0.0.1:{healthy_port}/")
+        await handler.shutdown()
+        await runner.cleanup()
+        return sends_to_dead, healthy
+
+    sends_to_dead, healthy = asyncio.run(main())
+    assert sends_to_dead == 2
+    assert healthy == "ok"
+
+
+def test_breaker_closes_after_reset_and_success():
+    async def main():
+        port = free_port()
+        url = f"http://127.0.0.1:{port}/"
+        handler = await configured_handler(retries=0, breaker_threshold=1, breaker_reset=0.2)
+        with pytest.raises(aiohttp.ClientConnectorError):
+            await handler.get(url)
+        with pytest.raises(HostUnavailableError):
+            await handler.get(url)
+
+        runner, _ = await start_server(ok, port)
+        await asyncio.sleep(0.3)
+        result = await handler.get(url)
+        state = dict(handler._host_state)
+        await handler.shutdown()
+        await runner.cleanup()
+        return result, state
+
+    result, state = asyncio.run(main())
+    assert result == "ok"
+    assert state == {}
+
+
+def test_gateway_errors_are_retried():
+    statuses = [503, 502]
+
+    async def flaky(request):
+        if statuses:
+            return web.Response(status=statuses.pop(0), text="busy")
+        return web.Response(text="ok")
+
+    async def main():
+        runner, port = await start_server(flaky)
+        handler = await configured_handler(retries=3)
+        calls = count_sends(handler)
+        result = await handler.get(f"http://127.0.0.1:{port}/")
+        state = dict(handler._host_state)
+        await handler.shutdown()
+        await runner.cleanup()
+        return result, len(calls), state
+
+    assert asyncio.run(main()) == ("ok", 3, {})
+
+
+def test_persistent_503_returns_body_and_trips_breaker():
+    async def unavailable(request):
+        return web.Response(status=503, text="down")
+
+    async def main():
+        runner, port = await start_server(unavailable)
+        url = f"http://127.0.0.1:{port}/"
+        handler = await configured_handler(retries=1, breaker_threshold=2, breaker_reset=60)
+        calls = count_sends(handler)
+        bodies = [await handler.get(url), await handler.get(url)]
+        with pytest.raises(HostUnavailableError):
+            await handler.get(url)
+        await handler.shutdown()
+        await runner.cleanup()
+        return bodies, len(calls)
+
+    assert asyncio.run(main()) == (["down", "down"], 4)
+
+
+def test_tls_failures_are_not_retried_or_counted():
+    async def main():
+        # a TLS handshake against a plain HTTP server fails at the SSL layer
+        runner, port = await start_server(ok)
+        handler = await configured_handler(retries=3, breaker_threshold=1)
+        calls = count_sends(handler)
+        with pytest.raises(aiohttp.ClientSSLError):
+            await handler.get(f"https://127.0.0.1:{port}/")
+        state = dict(handler._host_state)
+        await handler.shutdown()
+        await runner.cleanup()
+        return len(calls), state
+
+    assert asyncio.run(main()) == (1, {})
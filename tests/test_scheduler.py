@@ -0,0 +1,31 @@
+import asyncio
+
+from support import configured_handler, ok, start_server
+
+
+def test_batched_mode_serves_queued_requests():
+    async def main():
+        runner, port = await start_server(ok)
+        handler = await configured_handler(batch_range=(2, 2))
+        results = await asyncio.gather(*(handler.get(f"http://127.0.0.1:{port}/") for _ in range(5)))
+        await handler.shutdown()
+        await runner.cleanup()
+        return results
+
+    assert asyncio.run(main()) == ["ok"] * 5
+
+
+def test_idle_scheduler_wakes_up_for_new_requests():
+    async def main():
+        runner, port = await start_server(ok)
+        handler = await configured_handler()
+        # let the scheduler drain the deque and block on the wakeup event
+        await asyncio.sleep(0.05)
+        first = await asyncio.wait_for(handler.get(f"http://127.0.0.1:{port}/"), 2)
+        await asyncio.sleep(0.05)
+        second = await asyncio.wait_for(handler.get(f"http://127.0.0.1:{port}/"), 2)
+        await handler.shutdown()
+        await runner.cleanup()
+        return first, second
+
+    assert asyncio.run(main()) == ("ok", "ok")
@@ -0,0 +1,41 @@
+import asyncio
+
+from aiohttp import web
+
+from support import configured_handler, ok, start_server
+
+
+def test_streaming_mode_serves_every_request():
+    async def main():
+        runner, port = await start_server(ok)
+        handler = await configured_handler(scheduling="streaming")
+        results = await asyncio.gather(*(handler.get(f"http://127.0.0.1:{port}/") for _ in range(10)))
+        await handler.shutdown()
+        await runner.cleanup()
+        return results
+
+    assert asyncio.run(main()) == ["ok"] * 10
+
+
+def test_host_limit_caps_concurrency_in_streaming_mode():
+    in_flight = 0
+    peak = 0
+
+    async def slow(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return web.Response(text="ok")
+
+    async def main():
+        runner, port = await start_server(slow)
+        handler = await configured_handler(scheduling="streaming", host_limit=2)
+        results = await asyncio.gather(*(handler.get(f"http://127.0.0.1:{port}/") for _ in range(8)))
+        await handler.shutdown()
+        await runner.cleanup()
+        return results
+
+    assert asyncio.run(main()) == ["ok"] * 8
+    assert peak == 2